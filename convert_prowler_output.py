@@ -1,7 +1,14 @@
 #!/usr/bin/env python3
-import json
+import os
 from pathlib import Path
 
+from utils.jsonio import dump_bytes, loads
+
+try:
+    import ijson  # lazy iteration over large top-level arrays
+except ImportError:
+    ijson = None
+
 REPORTS_DIR = Path("reports")
 RAW_FILE = REPORTS_DIR / "aws_scan.json"   # input: raw Prowler JSON
 OUT_FILE = REPORTS_DIR / "aws_scan.json"   # output: normalized list (same path)
@@ -22,6 +29,34 @@ def extract_records(raw):
     return []
 
 
+def is_json_array(path):
+    """True if the first non-whitespace byte of the file is '['."""
+    with path.open("rb") as fh:
+        while True:
+            chunk = fh.read(4096)
+            if not chunk:
+                return False
+            chunk = chunk.lstrip()
+            if chunk:
+                return chunk[:1] == b"["
+
+
+def iter_records(path):
+    """
+    Yield raw Prowler rows from path.
+
+    A top-level array is walked lazily with ijson when it is installed;
+    anything else is loaded in full and handed to extract_records().
+    """
+    if ijson is not None and is_json_array(path):
+        with path.open("rb") as fh:
+            yield from ijson.items(fh, "item", use_float=True)
+        return
+
+    raw = loads(path.read_bytes())
+    yield from extract_records(raw)
+
+
 def normalize_record(row):
     """
     Convert one raw Prowler row into our normalized finding dict.
@@ -71,25 +106,27 @@ def main():
         print(f"[!] Raw Prowler JSON not found at {RAW_FILE}")
         return
 
+    # RAW_FILE and OUT_FILE are the same path, so stream into a temp file
+    # and swap it in once the whole input has been read.
+    tmp_file = OUT_FILE.with_name(OUT_FILE.name + ".tmp")
+    count = 0
     try:
-        raw = json.loads(RAW_FILE.read_text())
+        with tmp_file.open("wb") as out:
+            out.write(b"[")
+            for row in iter_records(RAW_FILE):
+                if not isinstance(row, dict):
+                    continue
+                out.write(b",\n" if count else b"\n")
+                out.write(dump_bytes(normalize_record(row), pretty=True))
+                count += 1
+            out.write(b"\n]\n" if count else b"]\n")
     except Exception as e:
+        tmp_file.unlink(missing_ok=True)
         print(f"[!] Failed to parse {RAW_FILE}: {e}")
         return
 
-    records = extract_records(raw)
-    if not isinstance(records, list):
-        print("[!] Prowler data is not a list; nothing to normalize")
-        return
-
-    normalized = []
-    for row in records:
-        if not isinstance(row, dict):
-            continue
-        normalized.append(normalize_record(row))
-
-    OUT_FILE.write_text(json.dumps(normalized, indent=2))
-    print(f"[+] Wrote normalized JSON array with {len(normalized)} findings to {OUT_FILE}")
+    os.replace(tmp_file, OUT_FILE)
+    print(f"[+] Wrote normalized JSON array with {count} findings to {OUT_FILE}")
 
 
 if __name__ == "__main__":
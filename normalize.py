@@ -10,7 +10,7 @@ Usage examples:
   python3 normalize.py --in combined_scanner.json --out out/
 
 What it produces:
-  out/normalized_findings.json     # unified schema across scanners
+  out/normalized_findings.json     # {"_schema": "cyb590.v1", "generated": ..., "findings": [unified schema across scanners]}
   out/compliance_summary.json      # per-framework pass/fail aggregation
   (stdout)                         # one-line run summary
 
@@ -20,13 +20,18 @@ Optional file:
 
 from __future__ import annotations
 import argparse
-import json
+import hashlib
+import mmap
 import os
 import re
 import sys
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, Dict, Iterable, List, Optional, Tuple
-from collections import defaultdict
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from operator import itemgetter
 
 # -------- Configs --------
 
@@ -38,128 +43,288 @@ SEVERITY_MAP = {
     "informational": "info", "information": "info", "info": "info", "passed": "info", "pass": "info"
 }
 
+# Tag on normalized_findings.json; inputs carrying it are passed through, not re-parsed
+SCHEMA_VERSION = "cyb590.v1"
+
+# Host that ran the Lynis audit; uname(2) once per process rather than per finding
+_HOSTNAME = os.uname().nodename if hasattr(os, "uname") else "host"
+
+# Written next to the outputs; holds the input_cache_key() of the run that produced them
+CACHE_KEY_FILE = ".cache_key"
+
 RISK_WEIGHT = {"critical": 5, "high": 3, "medium": 2, "low": 1, "info": 0}
 
+# SEVERITY_MAP plus identity entries for canonical names: one .get() resolves both
+_SEV_LOOKUP = {**{s: s for s in RISK_WEIGHT}, **SEVERITY_MAP}
+
+# Prowler statuses folded into FAIL; anything else is kept as reported
+_STATUS_LOOKUP = {"FAIL": "FAIL", "ALARM": "FAIL", "WARNING": "FAIL", "WARN": "FAIL"}
+
+# Severity order (most to least severe) and the matching weights
+SEV_ORDER = ("critical", "high", "medium", "low", "info")
+SEV_WEIGHTS = tuple(RISK_WEIGHT[s] for s in SEV_ORDER)
+SEV_RANK = {s: i for i, s in enumerate(SEV_ORDER)}
+
 # Lazy YAML import (optional dependency)
 try:
     import yaml  # type: ignore
 except Exception:
     yaml = None
 
+# Binary cache for the parsed compliance map (optional dependency)
+try:
+    import msgpack  # type: ignore
+except Exception:
+    msgpack = None
+
+from utils.jsonio import HAS_ORJSON, dump_bytes, loads
+
 # -------- Helpers --------
 
 def now_iso() -> str:
     return datetime.now(timezone.utc).astimezone().isoformat(timespec="seconds")
 
 def load_json_file(path: str) -> Any:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-def load_text_file(path: str) -> str:
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+    with open(path, "rb") as f:
+        if HAS_ORJSON and os.fstat(f.fileno()).st_size:
+            # orjson parses straight from the mapping; the OS pages the file in on demand
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as mv:
+                return loads(mv)
+        data = f.read()
+    return loads(data)
+
+def dump_json_file(path: str, obj: Any, pretty: bool = False) -> None:
+    """Write obj as compact UTF-8 JSON; pretty adds 2-space indentation for humans."""
+    with open(path, "wb") as f:
+        f.write(dump_bytes(obj, pretty))
+        f.write(b"\n")
+
+def load_bytes_file(path: str) -> bytes:
+    with open(path, "rb") as f:
         return f.read()
 
 def ensure_dir(d: str) -> None:
     os.makedirs(d, exist_ok=True)
 
+@lru_cache(maxsize=64)
+def _sev_for(v: str) -> str:
+    return _SEV_LOOKUP.get(v.strip().lower(), "info")
+
 def safe_sev(v: Optional[str]) -> str:
+    # Severity vocabulary is tiny, so the cached lookup skips strip()/lower() on repeats
     if not v:
         return "info"
-    key = str(v).strip().lower()
-    return SEVERITY_MAP.get(key, key if key in RISK_WEIGHT else "info")
+    return _sev_for(v if isinstance(v, str) else str(v))
+
+def input_cache_key(paths: Iterable[str], options: Iterable[str] = ()) -> str:
+    """
+    SHA-256 over (path, size, mtime) of every existing input, in the order given,
+    plus any output-affecting options.
+    Same key => same inputs as the run that produced the current outputs.
+    """
+    parts = [f"{p}:{os.path.getsize(p)}:{os.path.getmtime(p)}" for p in paths if os.path.isfile(p)]
+    parts.extend(options)
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
 
-def weight_for(sev: str) -> int:
-    return RISK_WEIGHT.get(sev, 0)
+def read_cache_key(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
 
-def coalesce(*vals, default=None):
-    for v in vals:
-        if v not in (None, "", []):
-            return v
-    return default
+def finding_sort_key(f: Dict[str, Any], _rank=SEV_RANK.get) -> Tuple[int, str]:
+    # Severity DESC, then title; unknown severities sort last
+    return _rank(f["severity"], 9), f["title"]
 
 # -------- Compliance mapping --------
 
-def load_compliance_map(path: str) -> Dict[str, Dict[str, List[str]]]:
+# (compiled pattern or None when the regex is invalid, source pattern, mapped controls)
+Rule = Tuple[Optional["re.Pattern[str]"], str, Tuple[str, ...]]
+Rules = Tuple[Rule, ...]
+# A scanner's rules plus its per-check_id memo of matched controls (see yaml_controls)
+RuleSet = Tuple[Rules, Dict[str, Tuple[str, ...]]]
+
+def compile_rules(mapping: Dict[str, List[str]]) -> Rules:
+    rules: List[Rule] = []
+    for pattern, mapped in mapping.items():
+        pattern = str(pattern)
+        try:
+            compiled: Optional["re.Pattern[str]"] = re.compile(pattern, re.IGNORECASE)
+        except re.error:
+            # bad regex in map; fall back to exact
+            compiled = None
+        if isinstance(mapped, str):
+            mapped = [mapped]
+        rules.append((compiled, pattern, tuple(c for c in mapped or () if isinstance(c, str))))
+    return tuple(rules)
+
+def compliance_cache_path(path: str) -> str:
+    head, tail = os.path.split(path)
+    return os.path.join(head, f".{tail}.cache")
+
+def read_compliance_cache(path: str, mtime_ns: int) -> Optional[Dict[str, Dict[str, List[str]]]]:
+    """Return the cached YAML mappings for path if the cache matches its mtime."""
+    if msgpack is None:
+        return None
+    try:
+        with open(compliance_cache_path(path), "rb") as f:
+            cached = msgpack.unpackb(f.read(), raw=False, strict_map_key=False)
+    except Exception:
+        return None
+    if not isinstance(cached, dict) or cached.get("mtime") != mtime_ns:
+        return None
+    data = cached.get("data")
+    if not isinstance(data, dict) or not {"prowler", "lynis"} <= data.keys():
+        return None
+    return data
+
+def write_compliance_cache(path: str, mtime_ns: int, data: Dict[str, Dict[str, List[str]]]) -> None:
+    if msgpack is None:
+        return
+    try:
+        payload = msgpack.packb({"mtime": mtime_ns, "data": data}, use_bin_type=True)
+        with open(compliance_cache_path(path), "wb") as f:
+            f.write(payload)
+    except Exception:
+        # Read-only checkout or YAML values msgpack can't encode; just skip the cache
+        pass
+
+def load_compliance_map(path: str) -> Dict[str, RuleSet]:
     """
     Returns:
       {
-        "prowler": { "<exact or regex>": ["CIS_AWS_1.2:1.2.3", "NIST_800-53:AC-3"], ... },
-        "lynis":   { "<exact or regex>": [...] }
+        "prowler": ( ( (re.compile("<exact or regex>"), "<exact or regex>", ("CIS_AWS_1.2:1.2.3", ...)), ... ), {} ),
+        "lynis":   ( ( ... ), {} )
       }
+    Patterns are compiled once here so map_compliance() only runs the match; the
+    empty dict next to each scanner's rules is yaml_controls()'s check_id memo.
+    The parsed YAML is cached with msgpack (keyed by the file's mtime) so warm
+    runs skip yaml.safe_load; compiled patterns aren't picklable, so they are
+    rebuilt from the cached source strings.
     """
-    empty = {"prowler": {}, "lynis": {}}
-    if not path or not os.path.isfile(path) or yaml is None:
+    empty: Dict[str, RuleSet] = {"prowler": ((), {}), "lynis": ((), {})}
+    if not path or not os.path.isfile(path):
         return empty
-    with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+    mtime_ns = os.stat(path).st_mtime_ns
+    data = read_compliance_cache(path, mtime_ns)
+    if data is None:
+        if yaml is None:
+            return empty
+        with open(path, "r", encoding="utf-8") as f:
+            loaded = yaml.safe_load(f) or {}
+        data = {
+            "prowler": loaded.get("prowler", {}) or {},
+            "lynis": loaded.get("lynis", {}) or {},
+        }
+        write_compliance_cache(path, mtime_ns, data)
     return {
-        "prowler": data.get("prowler", {}) or {},
-        "lynis": data.get("lynis", {}) or {},
+        "prowler": (compile_rules(data["prowler"]), {}),
+        "lynis": (compile_rules(data["lynis"]), {}),
     }
 
+def _native_item_str(item: str, controls: List[str]) -> None:
+    item = item.strip()
+    if item:
+        controls.append(item)
+
+def _native_item_dict(item: Dict[str, Any], controls: List[str]) -> None:
+    # Fast path: the Framework/Requirement pair used by current Prowler releases
+    fw, req = item.get("Framework"), item.get("Requirement")
+    if not fw:
+        fw = item.get("Standard") or item.get("FrameworkName")
+    if not req:
+        req = item.get("Control") or item.get("Id") or item.get("Section")
+    if fw and req:
+        controls.append(f"{fw}:{req}")
+
+def _native_from_list(comp: List[Any], controls: List[str]) -> None:
+    for item in comp:
+        handler = _NATIVE_ITEM_HANDLERS.get(type(item))
+        if handler is not None:
+            handler(item, controls)
+
+def _native_from_dict(comp: Dict[str, Any], controls: List[str]) -> None:
+    for fw, req in comp.items():
+        if type(req) is list:
+            controls.extend([f"{fw}:{r}" for r in req])
+        elif type(req) is str:
+            controls.append(f"{fw}:{req}")
+
+_NATIVE_ITEM_HANDLERS = {str: _native_item_str, dict: _native_item_dict}
+_NATIVE_HANDLERS = {list: _native_from_list, dict: _native_from_dict}
+
 def from_prowler_native_compliance(raw: Dict[str, Any]) -> List[str]:
     """Prowler sometimes includes Compliance/ComplianceRequirements fields."""
     controls: List[str] = []
     comp = raw.get("Compliance") or raw.get("ComplianceRequirements")
-    if isinstance(comp, list):
-        for item in comp:
-            if isinstance(item, str):
-                controls.append(item.strip())
-            elif isinstance(item, dict):
-                fw = item.get("Framework") or item.get("Standard") or item.get("FrameworkName")
-                req = item.get("Requirement") or item.get("Control") or item.get("Id") or item.get("Section")
-                if fw and req:
-                    controls.append(f"{fw}:{req}")
-    elif isinstance(comp, dict):
-        for fw, req in comp.items():
-            if isinstance(req, list):
-                controls.extend([f"{fw}:{r}" for r in req])
-            elif isinstance(req, str):
-                controls.append(f"{fw}:{req}")
-    return [c for c in controls if isinstance(c, str) and c.strip()]
-
-def map_compliance(scanner: str, check_id: str, raw: Dict[str, Any], cmap: Dict[str, Dict[str, List[str]]]) -> List[str]:
+    handler = _NATIVE_HANDLERS.get(type(comp))
+    if handler is not None:
+        handler(comp, controls)
+    return controls
+
+def yaml_controls(rule_set: RuleSet, check_id: str) -> Tuple[str, ...]:
+    """
+    Controls mapped to check_id by the YAML rules (exact/regex, precompiled by
+    load_compliance_map). Memoized per scanner on check_id: the same check fires
+    once per resource, so most findings repeat an earlier check_id and skip the
+    pattern scan.
+    """
+    rules, memo = rule_set
+    hit = memo.get(check_id)
+    if hit is None:
+        controls: List[str] = []
+        for compiled, pattern, mapped in rules:
+            if pattern == check_id or (compiled is not None and compiled.search(check_id)):
+                controls.extend(mapped)
+        hit = memo[check_id] = tuple(controls)
+    return hit
+
+def map_compliance(scanner: str, check_id: str, raw: Dict[str, Any], cmap: Dict[str, RuleSet]) -> List[str]:
     controls: List[str] = []
     # 1) Native Prowler metadata
     if scanner == "prowler":
         controls.extend(from_prowler_native_compliance(raw))
 
-    # 2) YAML mappings (exact/regex)
-    mapping = cmap.get(scanner, {})
-    for pattern, mapped in mapping.items():
-        try:
-            if pattern == check_id or re.search(pattern, check_id, re.IGNORECASE):
-                controls.extend(mapped or [])
-        except re.error:
-            # bad regex in map; fall back to exact
-            if pattern == check_id:
-                controls.extend(mapped or [])
+    # 2) YAML mappings
+    rule_set = cmap.get(scanner)
+    if rule_set is not None:
+        controls.extend(yaml_controls(rule_set, check_id))
 
     # unique + sorted
     return sorted({c.strip() for c in controls if isinstance(c, str) and c.strip()})
 
 # -------- Parsers --------
 
-def parse_prowler(obj: Dict[str, Any], cmap: Dict[str, Dict[str, List[str]]]) -> Optional[Dict[str, Any]]:
+# Source fields left out of raw.original (large and not used by any report)
+_RAW_DROP_KEYS = frozenset({"Remediation"})
+
+def parse_prowler(obj: Dict[str, Any], cmap: Dict[str, RuleSet],
+                  ts_default: Optional[str] = None, include_raw: bool = False) -> Optional[Dict[str, Any]]:
     """
     Expected fields (varies by prowler version):
       CheckID / CheckId, Status, Severity, Service, ResourceId/ResourceArn, AccountId, Region, Message, Remediation, etc.
+    ts_default is used when the record has no timestamp; pass the run timestamp
+    from main() so it isn't recomputed per finding.
+    include_raw keeps a trimmed copy of the source record under raw.original.
     """
     # Skip PASS/INFO unless you want to keep all; we keep FAIL/WARN-like by default
-    status_raw = str(obj.get("Status", obj.get("status", ""))).upper()
+    status_raw = obj["Status"] if "Status" in obj else obj.get("status", "")
+    status_raw = (status_raw if type(status_raw) is str else str(status_raw)).upper()
     # Common FAIL markers
-    status = "FAIL" if status_raw in ("FAIL", "ALARM", "WARNING", "WARN") else status_raw or "UNKNOWN"
+    status = _STATUS_LOOKUP.get(status_raw, status_raw) or "UNKNOWN"
 
     # Keep all findings; you can filter later in reporting if needed
-    check_id = coalesce(obj.get("CheckID"), obj.get("CheckId"), obj.get("CheckIDShort"), obj.get("Id"), default="unknown")
+    # Short-circuit "first truthy" chains: later .get() calls only run when needed
+    check_id = obj.get("CheckID") or obj.get("CheckId") or obj.get("CheckIDShort") or obj.get("Id") or "unknown"
     sev = safe_sev(obj.get("Severity"))
-    service = coalesce(obj.get("Service"), obj.get("Category"), default="unknown")
+    service = obj.get("Service") or obj.get("Category") or "unknown"
     region = obj.get("Region") or obj.get("AwsRegion") or ""
     account = obj.get("AccountId") or obj.get("Account") or ""
-    resource = coalesce(obj.get("ResourceId"), obj.get("ResourceArn"), obj.get("Resource") , default="")
-    title = coalesce(obj.get("CheckTitle"), obj.get("Title"), obj.get("CheckName"), default=str(check_id))
-    desc = coalesce(obj.get("Message"), obj.get("Description"), obj.get("Risk"), default="")
-    ts = coalesce(obj.get("Timestamp"), obj.get("CreatedAt"), obj.get("UpdatedAt"), default=now_iso())
+    resource = obj.get("ResourceId") or obj.get("ResourceArn") or obj.get("Resource") or ""
+    title = obj.get("CheckTitle") or obj.get("Title") or obj.get("CheckName") or str(check_id)
+    desc = obj.get("Message") or obj.get("Description") or obj.get("Risk") or ""
+    ts = obj.get("Timestamp") or obj.get("CreatedAt") or obj.get("UpdatedAt") or ts_default or now_iso()
 
     compliance = map_compliance("prowler", str(check_id), obj, cmap)
 
@@ -176,86 +341,186 @@ def parse_prowler(obj: Dict[str, Any], cmap: Dict[str, Dict[str, List[str]]]) ->
         "account": str(account),
         "timestamp": str(ts),
         "compliance": compliance,
-        "raw": {
-            "original": obj
-        }
     }
+    if include_raw:
+        # Drop bulky fields that are either unused downstream or already in "description"
+        original = {k: v for k, v in obj.items() if k not in _RAW_DROP_KEYS}
+        if original.get("Description") == desc:
+            del original["Description"]
+        norm["raw"] = {"original": original}
     return norm
 
-def parse_lynis_dat(text: str, cmap: Dict[str, Dict[str, List[str]]]) -> Iterable[Dict[str, Any]]:
+# suggestion[]=ID|Message..., warning[]=ID|Message..., ok[]=ID|Message...
+_LYNIS_RE = re.compile(rb"^[ \t]*(suggestion|warning|ok)\[\]=([^|\n]*)(?:\|([^\n]*))?$", re.M)
+_LYNIS_HOST_RE = re.compile(rb"^hostname=([^\n]*)$", re.M)
+
+# Every Lynis finding shares these fields; key order matches parse_prowler output
+_LYNIS_TEMPLATE: Dict[str, Any] = {
+    "scanner": "lynis",
+    "check_id": None,
+    "title": None,
+    "description": None,
+    "severity": None,
+    "status": None,
+    "service": "host",
+    "resource": _HOSTNAME,
+    "region": "",
+    "account": "",
+    "timestamp": None,
+    "compliance": None,
+    "raw": None,
+}
+
+def parse_lynis_dat(data: bytes, cmap: Dict[str, RuleSet],
+                    ts_default: Optional[str] = None, include_raw: bool = False) -> Iterable[Dict[str, Any]]:
     """
     Lynis .dat is key=value lines; findings often appear as:
       suggestion[]=SSH-7408|Disable root login ...
       warning[]=ACCT-9630|Enable process accounting ...
     We'll parse suggestion[] and warning[] as failing statuses; ok[] as PASS.
+    The report is scanned as bytes; only matched fields are decoded.
     """
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    for ln in lines:
-        if "suggestion[]=" in ln or "warning[]=" in ln:
-            # Format: key[]=ID|Message
-            _, payload = ln.split("=", 1)
-            parts = payload.split("|", 1)
-            test_id = parts[0].strip()
-            msg = parts[1].strip() if len(parts) > 1 else ""
-            sev = "medium" if "warning" in ln else "low"
-            status = "FAIL"
-            title = msg.split(".")[0][:140] if msg else test_id
-            compliance = map_compliance("lynis", test_id, {}, cmap)
-            yield {
-                "scanner": "lynis",
-                "check_id": test_id,
-                "title": title,
-                "description": msg,
-                "severity": sev,
-                "status": status,
-                "service": "host",
-                "resource": os.uname().nodename if hasattr(os, "uname") else "host",
-                "region": "",
-                "account": "",
-                "timestamp": now_iso(),
-                "compliance": compliance,
-                "raw": {"line": ln}
-            }
-        elif "ok[]=" in ln:
+    # Constant fields are filled once; each finding is a dict.copy() of this base
+    base = dict(_LYNIS_TEMPLATE, timestamp=ts_default or now_iso())
+    # Resource is the audited host as recorded in the report, else this machine
+    host = _LYNIS_HOST_RE.search(data)
+    if host:
+        base["resource"] = host.group(1).decode("utf-8", "ignore").strip() or _HOSTNAME
+    if not include_raw:
+        del base["raw"]
+    for m in _LYNIS_RE.finditer(data):
+        kind = m.group(1)
+        test_id = m.group(2).decode("utf-8", "ignore").strip()
+        msg = (m.group(3) or b"").decode("utf-8", "ignore").strip()
+        d = base.copy()
+        d["check_id"] = test_id
+        d["title"] = msg.split(".")[0][:140] if msg else test_id
+        d["description"] = msg
+        if kind == b"ok":
             # PASS entries (keep but low weight)
-            _, payload = ln.split("=", 1)
-            parts = payload.split("|", 1)
-            test_id = parts[0].strip()
-            msg = parts[1].strip() if len(parts) > 1 else ""
-            title = msg.split(".")[0][:140] if msg else test_id
-            compliance = map_compliance("lynis", test_id, {}, cmap)
-            yield {
-                "scanner": "lynis",
-                "check_id": test_id,
-                "title": title,
-                "description": msg,
-                "severity": "info",
-                "status": "PASS",
-                "service": "host",
-                "resource": os.uname().nodename if hasattr(os, "uname") else "host",
-                "region": "",
-                "account": "",
-                "timestamp": now_iso(),
-                "compliance": compliance,
-                "raw": {"line": ln}
-            }
+            d["severity"], d["status"] = "info", "PASS"
+        else:
+            d["severity"], d["status"] = ("medium" if kind == b"warning" else "low"), "FAIL"
+        d["compliance"] = map_compliance("lynis", test_id, {}, cmap)
+        if include_raw:
+            d["raw"] = {"line": m.group(0).decode("utf-8", "ignore").strip()}
+        yield d
+
+def is_normalized_output(data: Any) -> bool:
+    """True for a normalized_findings.json written by this tool (see SCHEMA_VERSION)."""
+    return (isinstance(data, dict) and data.get("_schema") == SCHEMA_VERSION
+            and isinstance(data.get("findings"), list))
+
+def passthrough_findings(items: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Already-normalized findings, taken as-is. Every finding is guaranteed to carry
+    "severity" and "title" so sorting/summaries can index them directly.
+    """
+    out: List[Dict[str, Any]] = []
+    for x in items:
+        if isinstance(x, dict):
+            x.setdefault("severity", "info")
+            x.setdefault("title", "")
+            out.append(x)
+    return out
+
+# Keys every normalized finding carries (check_id/control_id varies by tool version);
+# raw Prowler records use CheckTitle/Severity/Status/... instead
+_NORMALIZED_KEYS = frozenset({"scanner", "title", "severity", "status"})
+
+def findings_from_records(objs: List[Dict[str, Any]], cmap: Dict[str, RuleSet], run_ts: str,
+                          include_raw: bool = False) -> List[Dict[str, Any]]:
+    """
+    Prowler records go through parse_prowler; records already in our schema (e.g. an
+    untagged normalized_findings.json from an older run) are kept as-is. The check is
+    a key-set test on the dict, so no per-record serialization is needed.
+    """
+    findings: List[Dict[str, Any]] = []
+    for obj in objs:
+        if _NORMALIZED_KEYS <= obj.keys():
+            findings.append(obj)
+            continue
+        norm = parse_prowler(obj, cmap, run_ts, include_raw)
+        if norm:
+            findings.append(norm)
+    return findings
+
+def process_input(path: str, cmap: Dict[str, RuleSet], run_ts: str,
+                  include_raw: bool = False) -> List[Dict[str, Any]]:
+    """Parse one input file into normalized findings. Runs in a worker process."""
+    findings: List[Dict[str, Any]] = []
+    if not os.path.exists(path):
+        print(f"[WARN] input not found: {path}", file=sys.stderr)
+        return findings
+
+    # Heuristic: JSON → prowler or combined; .dat/.txt → lynis
+    lower = path.lower()
+    try:
+        if lower.endswith(".json"):
+            data = load_json_file(path)
+            if is_normalized_output(data):
+                # Our own earlier output: pass through without re-parsing
+                return passthrough_findings(data["findings"])
+            # Prowler may emit a list, or a dict with 'Findings'/'Results'
+            objs: List[Dict[str, Any]] = []
+            if isinstance(data, list):
+                objs = [x for x in data if isinstance(x, dict)]
+            elif isinstance(data, dict):
+                # If it's a combined structure, flatten best-effort
+                if "Findings" in data and isinstance(data["Findings"], list):
+                    objs = [x for x in data["Findings"] if isinstance(x, dict)]
+                elif "Results" in data and isinstance(data["Results"], list):
+                    objs = [x for x in data["Results"] if isinstance(x, dict)]
+                else:
+                    # try to guess it's already normalized
+                    if "scanner" in data and "check_id" in data:
+                        objs = [data]
+                    else:
+                        # pick all dicts anywhere shallow
+                        for v in data.values():
+                            if isinstance(v, list):
+                                objs.extend([x for x in v if isinstance(x, dict)])
+            findings.extend(findings_from_records(objs, cmap, run_ts, include_raw))
+
+        elif lower.endswith(".dat") or lower.endswith(".txt") or "lynis" in lower:
+            data = load_bytes_file(path)
+            findings.extend(list(parse_lynis_dat(data, cmap, run_ts, include_raw)))
+
+        else:
+            # Fallback: try JSON parse, else treat as text lynis style
+            try:
+                data = load_json_file(path)
+                if isinstance(data, list):
+                    objs = [x for x in data if isinstance(x, dict)]
+                    findings.extend(findings_from_records(objs, cmap, run_ts, include_raw))
+                elif isinstance(data, dict):
+                    # Already normalized?
+                    arr = data.get("findings")
+                    if isinstance(arr, list):
+                        findings.extend(passthrough_findings(arr))
+            except Exception:
+                data = load_bytes_file(path)
+                findings.extend(list(parse_lynis_dat(data, cmap, run_ts, include_raw)))
+
+    except Exception as e:
+        print(f"[WARN] failed to parse {path}: {e}", file=sys.stderr)
+
+    return findings
 
 # -------- Aggregation / Risk / Compliance Summary --------
 
 def summarize(findings: List[Dict[str, Any]]) -> Dict[str, Any]:
-    counts = {"critical": 0, "high": 0, "medium": 0, "low": 0, "info": 0}
-    total = 0
-    for f in findings:
-        sev = f.get("severity", "info")
-        if sev not in counts:
-            sev = "info"
-        counts[sev] += 1
-        total += 1
+    # Single pass: tally severities, then derive totals and risk from the tallies
+    tally = Counter(map(itemgetter("severity"), findings))
+    counts = {sev: 0 for sev in SEV_ORDER}
+    for sev, n in tally.items():
+        counts[sev if sev in counts else "info"] += n
+    total = sum(counts.values())
 
     # Average risk = mean of weights across all findings (including info=0)
     # You can filter PASS here if desired; we keep everything for transparency.
-    weights = [weight_for(f.get("severity", "info")) for f in findings]
-    avg_risk = round(sum(weights) / max(1, len(weights)), 2)
+    weighted = sum(w * counts[sev] for sev, w in zip(SEV_ORDER, SEV_WEIGHTS))
+    avg_risk = round(weighted / max(1, total), 2)
 
     # Simple A–F grade
     # 0–0.5 A, 0.51–1.5 B, 1.51–2.5 C, 2.51–3.5 D, 3.51–4.5 E, >4.5 F
@@ -272,6 +537,8 @@ def summarize(findings: List[Dict[str, Any]]) -> Dict[str, Any]:
         "risk": {"avg": avg_risk, "grade": letter(avg_risk)}
     }
 
+_FAIL_STATUSES = frozenset({"FAIL", "ALARM", "WARNING", "SUGGESTION"})
+
 def build_compliance_summary(findings: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Structure:
@@ -283,26 +550,20 @@ def build_compliance_summary(findings: List[Dict[str, Any]]) -> Dict[str, Any]:
       "NIST_800-53": { ... }
     }
     """
-    agg: Dict[str, Dict[str, Dict[str, int]]] = defaultdict(lambda: {"failing_controls": defaultdict(int),
-                                                                     "passing_controls": defaultdict(int)})
+    # One flat counter keyed by (framework, bucket, control), pivoted once at the end
+    tally: Counter = Counter()
     for f in findings:
-        status = (f.get("status") or "").upper()
-        for ctrl in f.get("compliance", []) or []:
+        bucket = "failing_controls" if (f.get("status") or "").upper() in _FAIL_STATUSES else "passing_controls"
+        for ctrl in f.get("compliance") or ():
             fw = ctrl.split(":", 1)[0] if ":" in ctrl else "Unknown"
-            if status in ("FAIL", "ALARM", "WARNING", "SUGGESTION"):
-                agg[fw]["failing_controls"][ctrl] += 1
-            else:
-                agg[fw]["passing_controls"][ctrl] += 1
+            tally[(fw, bucket, ctrl)] += 1
 
-    # Convert nested defaultdicts to plain dicts
-    def plain(d):
-        if isinstance(d, defaultdict):
-            d = {k: plain(v) for k, v in d.items()}
-        elif isinstance(d, dict):
-            d = {k: plain(v) for k, v in d.items()}
-        return d
-
-    return plain(agg)
+    agg: Dict[str, Dict[str, Dict[str, int]]] = {}
+    for (fw, bucket, ctrl), n in tally.items():
+        if fw not in agg:
+            agg[fw] = {"failing_controls": {}, "passing_controls": {}}
+        agg[fw][bucket][ctrl] = n
+    return agg
 
 # -------- Main --------
 
@@ -313,92 +574,64 @@ def main():
     ap.add_argument("--out", dest="out_dir", default="out", help="Output directory (default: out)")
     ap.add_argument("--compliance-map", dest="cmap_path", default="compliance_map.yaml",
                     help="YAML map of check IDs/patterns to compliance controls (default: compliance_map.yaml)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="Re-parse inputs even if they are unchanged since the last run")
+    ap.add_argument("--include-raw", action="store_true",
+                    help="Keep the source record under 'raw' in each finding (larger output)")
+    ap.add_argument("--pretty", action="store_true",
+                    help="Indent JSON outputs for reading (default: compact, smaller and faster to write)")
+    ap.add_argument("--jobs", type=int, default=0,
+                    help="Worker processes for parsing inputs (default: CPU count; 1 = serial)")
     args = ap.parse_args()
 
     out_dir = args.out_dir
     ensure_dir(out_dir)
 
+    normalized_path = os.path.join(out_dir, "normalized_findings.json")
+    compliance_path = os.path.join(out_dir, "compliance_summary.json")
+    cache_path = os.path.join(out_dir, CACHE_KEY_FILE)
+
+    # Skip all parsing when inputs (and the compliance map) are unchanged since the last run.
+    # normalize.py itself and SCHEMA_VERSION are keyed too, so a parser fix or schema bump
+    # re-renders even when the scanner inputs are unchanged.
+    cache_key = input_cache_key(list(args.inputs) + [args.cmap_path, os.path.abspath(__file__)],
+                                [f"schema={SCHEMA_VERSION}", f"include_raw={args.include_raw}",
+                                 f"pretty={args.pretty}"])
+    if (not args.no_cache and read_cache_key(cache_path) == cache_key
+            and os.path.isfile(normalized_path) and os.path.isfile(compliance_path)):
+        print(f"[normalize] cache hit ({cache_key[:12]}), inputs unchanged -> "
+              f"{os.path.relpath(normalized_path)} , {os.path.relpath(compliance_path)}")
+        return
+
     cmap = load_compliance_map(args.cmap_path)
+    run_ts = now_iso()
 
     findings: List[Dict[str, Any]] = []
 
-    for path in args.inputs:
-        if not os.path.exists(path):
-            print(f"[WARN] input not found: {path}", file=sys.stderr)
-            continue
-
-        # Heuristic: JSON → prowler or combined; .dat/.txt → lynis
-        lower = path.lower()
-        try:
-            if lower.endswith(".json"):
-                data = load_json_file(path)
-                # Prowler may emit a list, or a dict with 'Findings'/'Results'
-                objs: List[Dict[str, Any]] = []
-                if isinstance(data, list):
-                    objs = [x for x in data if isinstance(x, dict)]
-                elif isinstance(data, dict):
-                    # If it's a combined structure, flatten best-effort
-                    if "Findings" in data and isinstance(data["Findings"], list):
-                        objs = [x for x in data["Findings"] if isinstance(x, dict)]
-                    elif "Results" in data and isinstance(data["Results"], list):
-                        objs = [x for x in data["Results"] if isinstance(x, dict)]
-                    else:
-                        # try to guess it's already normalized
-                        if "scanner" in data and "check_id" in data:
-                            objs = [data]
-                        else:
-                            # pick all dicts anywhere shallow
-                            for v in data.values():
-                                if isinstance(v, list):
-                                    objs.extend([x for x in v if isinstance(x, dict)])
-                for obj in objs:
-                    norm = parse_prowler(obj, cmap)
-                    if norm:
-                        findings.append(norm)
-
-            elif lower.endswith(".dat") or lower.endswith(".txt") or "lynis" in lower:
-                text = load_text_file(path)
-                findings.extend(list(parse_lynis_dat(text, cmap)))
-
-            else:
-                # Fallback: try JSON parse, else treat as text lynis style
-                try:
-                    data = load_json_file(path)
-                    if isinstance(data, list):
-                        for obj in data:
-                            if isinstance(obj, dict):
-                                norm = parse_prowler(obj, cmap)
-                                if norm:
-                                    findings.append(norm)
-                    elif isinstance(data, dict):
-                        # Already normalized?
-                        arr = data.get("findings")
-                        if isinstance(arr, list):
-                            findings.extend([x for x in arr if isinstance(x, dict)])
-                except Exception:
-                    text = load_text_file(path)
-                    findings.extend(list(parse_lynis_dat(text, cmap)))
-
-        except Exception as e:
-            print(f"[WARN] failed to parse {path}: {e}", file=sys.stderr)
+    # Each input is parsed independently (CPU-bound), so fan out across processes
+    jobs = args.jobs or os.cpu_count() or 1
+    if jobs > 1 and len(args.inputs) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(args.inputs))) as ex:
+            for res in ex.map(process_input, args.inputs, repeat(cmap), repeat(run_ts),
+                              repeat(args.include_raw)):
+                findings.extend(res)
+    else:
+        for path in args.inputs:
+            findings.extend(process_input(path, cmap, run_ts, args.include_raw))
 
     # Sort findings by severity DESC then title
-    sev_order = {"critical": 0, "high": 1, "medium": 2, "low": 3, "info": 4}
-    findings.sort(key=lambda f: (sev_order.get(f.get("severity", "info"), 9), f.get("title", "")))
+    findings.sort(key=finding_sort_key)
 
     # Compute summaries
     summary = summarize(findings)
     compliance_summary = build_compliance_summary(findings)
 
-    # Write outputs
-    normalized_path = os.path.join(out_dir, "normalized_findings.json")
-    compliance_path = os.path.join(out_dir, "compliance_summary.json")
-
-    with open(normalized_path, "w", encoding="utf-8") as f:
-        json.dump(findings, f, indent=2)
-
-    with open(compliance_path, "w", encoding="utf-8") as f:
-        json.dump(compliance_summary, f, indent=2)
+    # Write outputs; the cache key goes last so a partial write is never a cache hit
+    dump_json_file(normalized_path, {"_schema": SCHEMA_VERSION, "generated": run_ts, "findings": findings},
+                   pretty=args.pretty)
+    dump_json_file(compliance_path, compliance_summary, pretty=args.pretty)
+    with open(cache_path, "w", encoding="utf-8") as f:
+        f.write(cache_key + "\n")
 
     # One-line console summary for Jenkins logs
     print(f"[normalize] findings={summary['totals']['findings']} "
@@ -54,6 +54,9 @@ DST = "out/compliance_summary.json"
 
 with open(SRC, "r", encoding="utf-8") as f:
     findings = json.load(f)
+# normalize.py wraps findings as {"_schema": ..., "findings": [...]}
+if isinstance(findings, dict):
+    findings = findings.get("findings") or []
 
 agg = defaultdict(lambda: {
     "failing_controls": defaultdict(int),
@@ -2,6 +2,8 @@ import subprocess
 from pathlib import Path
 import json
 
+from utils.jsonio import loads
+
 # Where normalized results will be saved
 OUT = Path("reports/aws_scan.json")
 # Where prowler writes raw JSONL files
@@ -28,30 +30,34 @@ def run_aws_scan():
         raise RuntimeError(f"prowler exited with code {rc}")
 
     # Find newest prowler-output-*.json file
-    candidates = sorted(
+    latest = max(
         OUTPUT_DIR.glob("prowler-output-*.json"),
         key=lambda p: p.stat().st_mtime,
-        reverse=True
+        default=None
     )
-    if not candidates:
+    if latest is None:
         raise FileNotFoundError("No prowler JSON found in ./output")
-    latest = candidates[0]
 
-    # Convert JSONL -> JSON array and keep only objects
-    items = []
-    with latest.open("r", encoding="utf-8") as f:
-        for line in f:
+    # Stream JSONL -> JSON array, keeping only objects; one record in memory at a time.
+    # Each line is parsed only to validate it and is then copied through as-is, so
+    # the output is one compact record per line with no re-serialization.
+    count = 0
+    with latest.open("r", encoding="utf-8") as src, OUT.open("w", encoding="utf-8") as out:
+        out.write("[")
+        for line in src:
             line = line.strip()
             if not line:
                 continue
             try:
-                obj = json.loads(line)
-                if isinstance(obj, dict):      # ✅ Only keep real JSON objects
-                    items.append(obj)
+                obj = loads(line)
             except json.JSONDecodeError:
                 # Ignore malformed/empty lines
-                pass
+                continue
+            if not isinstance(obj, dict):      # ✅ Only keep real JSON objects
+                continue
+            out.write(",\n" if count else "\n")
+            out.write(line)
+            count += 1
+        out.write("\n]\n" if count else "]\n")
 
-    # Write normalized JSON array to reports/aws_scan.json
-    OUT.write_text(json.dumps(items, indent=2))
-    print(f"[+] AWS scan saved to {OUT} ({len(items)} findings) [from {latest.name}]")
+    print(f"[+] AWS scan saved to {OUT} ({count} findings) [from {latest.name}]")
@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 import argparse
-import json
+import bisect
+import heapq
 import os
-from collections import Counter, defaultdict
 from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
-from jinja2 import Template
+from sys import intern
+from jinja2 import DictLoader, Environment, select_autoescape
+from markupsafe import Markup
+
+from utils.jsonio import dump_bytes, loads
 
 # ----------------------------
 # Config
@@ -19,6 +24,8 @@ SEVERITY_WEIGHT = {
     "info": 0,
 }
 
+SEVERITY_ORDER = ["critical", "high", "medium", "low", "info"]
+
 GRADE_THRESHOLDS = [
     ("A", 0, 10),
     ("B", 11, 25),
@@ -27,6 +34,10 @@ GRADE_THRESHOLDS = [
     ("F", 81, 10**9),
 ]
 
+# Upper bound of every grade but the last; a total above a bound falls into the next grade
+GRADE_BOUNDS = [hi for _, _, hi in GRADE_THRESHOLDS[:-1]]
+GRADE_LETTERS = [letter for letter, _, _ in GRADE_THRESHOLDS]
+
 HTML_TEMPLATE = r"""
 <!doctype html>
 <html>
@@ -92,7 +103,7 @@ HTML_TEMPLATE = r"""
       <tbody>
         {% for sev in ["critical","high","medium","low","info"] %}
         <tr>
-          <td><span class="badge sev-{{ sev }}">{{ sev|capitalize }}</span></td>
+          <td>{{ badges[sev] }}</td>
           <td>{{ breakdown.counts.get(sev, 0) }}</td>
           <td>{{ breakdown.weights.get(sev, 0) }}</td>
         </tr>
@@ -116,7 +127,7 @@ HTML_TEMPLATE = r"""
         {% for f in top_findings %}
         <tr>
           <td>{{ f.get("title") or f.get("id") }}</td>
-          <td><span class="badge sev-{{ f['severity'] }}">{{ f['severity']|capitalize }}</span></td>
+          <td>{{ badges[f['severity']] }}</td>
           <td>{{ f.get("asset") or "—" }}</td>
           <td>{{ f["_score"] }}</td>
         </tr>
@@ -142,7 +153,7 @@ HTML_TEMPLATE = r"""
         <tr>
           <td>{{ f.get("id") or loop.index }}</td>
           <td>{{ f.get("title") or "—" }}</td>
-          <td><span class="badge sev-{{ f['severity'] }}">{{ f['severity']|capitalize }}</span></td>
+          <td>{{ badges[f['severity']] }}</td>
           <td>{{ f.get("asset") or "—" }}</td>
           <td>{{ f["_score"] }}</td>
         </tr>
@@ -164,22 +175,26 @@ HTML_TEMPLATE = r"""
 </html>
 """
 
+# Severity badge cells are identical for every row of a given severity, so build them once
+# (Markup: already-safe HTML, not re-escaped by autoescape)
+BADGE_HTML = {s: Markup(f'<span class="badge sev-{s}">{s.capitalize()}</span>') for s in SEVERITY_ORDER}
+
+# Compiled once at import; autoescape because titles/assets come from scanner output
+# and MarkupSafe escapes each value in C.
+_ENV = Environment(
+    loader=DictLoader({"report.html": HTML_TEMPLATE}),
+    autoescape=select_autoescape(["html"]),
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+_TPL = _ENV.get_template("report.html")
+
 # ----------------------------
 # Helpers
 # ----------------------------
 
-def score_finding(f: dict) -> float:
-    sev = (f.get("severity") or "").lower().strip()
-    w = SEVERITY_WEIGHT.get(sev, 0)
-    ac = float(f.get("asset_criticality", 1.0))
-    conf = float(f.get("confidence", 1.0))
-    return round(w * ac * conf, 2)
-
 def grade_from_score(total: float) -> str:
-    for letter, lo, hi in GRADE_THRESHOLDS:
-        if lo <= total <= hi:
-            return letter
-    return "F"
+    return GRADE_LETTERS[bisect.bisect_left(GRADE_BOUNDS, total)]
 
 def normalize_input_findings(infile: str) -> list[dict]:
     """
@@ -188,7 +203,7 @@ def normalize_input_findings(infile: str) -> list[dict]:
       2) dict containing findings under common keys (findings/results/items/data)
       3) any other structure -> []
     """
-    raw = json.loads(Path(infile).read_text())
+    raw = loads(Path(infile).read_bytes())
 
     if isinstance(raw, list):
         findings = raw
@@ -219,67 +234,83 @@ def main():
 
     findings = normalize_input_findings(args.infile)
 
-    # Compute scores & severity breakdown
-    cleaned: list[dict] = []
-    counts = Counter()
-    weight_by_sev = defaultdict(float)
-
+    # Single pass: normalize severity, score, and update every aggregate (findings updated in place)
+    counts = dict.fromkeys(SEVERITY_ORDER, 0)
+    weight_by_sev = dict.fromkeys(SEVERITY_ORDER, 0.0)
+    by_asset: dict[str, list] = {}  # asset -> [score, count]
+    total_score = 0.0
+    # Hot-loop names bound as locals (LOAD_FAST instead of global/builtin lookups)
+    sev_weights, _float, _round, _intern = SEVERITY_WEIGHT, float, round, intern
     for f in findings:
         sev = (f.get("severity") or "info").lower()
-        if sev not in SEVERITY_WEIGHT:
+        if sev not in sev_weights:
             sev = "info"
+        sev = _intern(sev)
         f["severity"] = sev
-        f["_score"] = score_finding(f)
+        # Score = severity weight x asset_criticality x confidence; inputs are usually floats already
+        ac = f.get("asset_criticality", 1.0)
+        if type(ac) is not float:
+            ac = _float(ac)
+        conf = f.get("confidence", 1.0)
+        if type(conf) is not float:
+            conf = _float(conf)
+        score = _round(sev_weights[sev] * ac * conf, 2)
+        f["_score"] = score
 
-        cleaned.append(f)
         counts[sev] += 1
-        weight_by_sev[sev] += f["_score"]
+        weight_by_sev[sev] += score
+        total_score += score
+        key = f.get("asset") or "—"
+        slot = by_asset.get(key)
+        if slot is None:
+            slot = by_asset[key] = [0.0, 0]
+        slot[0] += score
+        slot[1] += 1
 
-    total_score = round(sum(f["_score"] for f in cleaned), 2)
+    total_score = round(total_score, 2)
     grade = grade_from_score(total_score)
 
-    # Asset aggregation
-    by_asset = defaultdict(lambda: {"score": 0.0, "count": 0})
-    for f in cleaned:
-        key = f.get("asset") or "—"
-        by_asset[key]["score"] += float(f["_score"])
-        by_asset[key]["count"] += 1
-
-    assets_top = sorted(
-        [{"asset": k, "score": round(v["score"], 2), "count": v["count"]} for k, v in by_asset.items()],
-        key=lambda x: x["score"],
-        reverse=True
-    )[:10]
+    assets_top = heapq.nlargest(
+        10,
+        ({"asset": k, "score": round(v[0], 2), "count": v[1]} for k, v in by_asset.items()),
+        key=itemgetter("score")
+    )
 
-    top_findings = sorted(cleaned, key=lambda f: f["_score"], reverse=True)[:15]
+    top_findings = heapq.nlargest(15, findings, key=itemgetter("_score"))
 
-    generated_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    # One clock read for both the HTML header and the summary timestamp
+    now = datetime.now(timezone.utc)
+    generated_at = now.strftime("%Y-%m-%d %H:%M UTC")
 
-    html = Template(HTML_TEMPLATE).render(
+    ctx = dict(
         generated_at=generated_at,
-        totals={"findings": len(cleaned), "score": total_score, "grade": grade},
-        breakdown={"counts": counts, "weights": dict(weight_by_sev)},
+        totals={"findings": len(findings), "score": total_score, "grade": grade},
+        # Weights only for severities present, so absent rows render as 0
+        breakdown={"counts": counts, "weights": {k: w for k, w in weight_by_sev.items() if counts[k]}},
         assets_top=assets_top,
         top_findings=top_findings,
-        all_findings=cleaned,
+        all_findings=findings,
+        badges=BADGE_HTML,
         grading_text=""
     )
 
-    # Write HTML
+    # Write HTML, streamed to disk so the full page is never held as one string;
+    # the 1 MiB buffer turns the many small template chunks into a few large write()s
     out_html = Path(args.outdir) / "risk_report.html"
-    out_html.write_text(html)
+    with out_html.open("w", encoding="utf-8", buffering=1 << 20) as fh:
+        _TPL.stream(**ctx).dump(fh)
     print(f"Wrote: {out_html}")
 
     # Write summary JSON for dashboard ingestion
     out_summary = Path(args.outdir) / "risk_summary.json"
     summary_payload = {
-        "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "timestamp": now.isoformat().replace("+00:00", "Z"),
         "score": total_score,
         "grade": grade,
-        "total_findings": len(cleaned),
-        "counts": {k: int(counts.get(k, 0)) for k in ["critical", "high", "medium", "low", "info"]},
+        "total_findings": len(findings),
+        "counts": {k: int(counts.get(k, 0)) for k in SEVERITY_ORDER},
     }
-    out_summary.write_text(json.dumps(summary_payload, indent=2))
+    out_summary.write_bytes(dump_bytes(summary_payload, pretty=True))
     print(f"Wrote: {out_summary}")
 
     # Write PDF (optional)
@@ -287,7 +318,8 @@ def main():
         try:
             from weasyprint import HTML
             out_pdf = Path(args.outdir) / "risk_report.pdf"
-            HTML(string=html).write_pdf(str(out_pdf))
+            # Read back the HTML just written rather than rendering the page a second time
+            HTML(filename=str(out_html)).write_pdf(str(out_pdf))
             print(f"Wrote: {out_pdf}")
         except Exception as e:
             print("PDF generation failed:", e)
@@ -9,13 +9,24 @@ Build a single normalized findings list for the report/dashboard.
 - Writes reports/combined_findings.json
 """
 
-import json
+import re
+import sys
 from pathlib import Path
+from sys import intern
+
+if __package__ in (None, ""):
+    # Run as a script (python3 utils/build_findings.py): make the repo root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.jsonio import HAS_ORJSON, dump_bytes, loads
 
 AWS_IN = Path("reports/aws_scan.json")
 LYNIS_IN = Path("reports/lynis-report.dat")
 OUT = Path("reports/combined_findings.json")
 
+# suggestion[]=ID|Description|... / warning[]=ID|Description|... (one per line)
+LYNIS_RE = re.compile(rb"^[ \t]*(suggestion|warning)\[\]=([^\n]*)", re.M)
+
 
 def load_aws_findings():
     """Load normalized AWS findings (list of dicts) from aws_scan.json."""
@@ -24,7 +35,7 @@ def load_aws_findings():
         return []
 
     try:
-        data = json.loads(AWS_IN.read_text())
+        data = loads(AWS_IN.read_bytes())
     except Exception as e:
         print(f"[!] Failed to parse {AWS_IN}: {e}")
         return []
@@ -40,10 +51,11 @@ def load_aws_findings():
 
         fid = rec.get("id")
         title = rec.get("title") or ""
-        sev = (rec.get("severity") or "info").lower()
+        # Few distinct severities/services: intern so every finding shares one string object
+        sev = intern((rec.get("severity") or "info").lower())
         svc = rec.get("service")
         if svc:
-            svc = str(svc).lower()
+            svc = intern(str(svc).lower())
         else:
             svc = None
 
@@ -79,40 +91,36 @@ def load_lynis_findings():
 
     findings = []
     try:
-        for line in LYNIS_IN.read_text().splitlines():
-            line = line.strip()
-            if not line:
-                continue
-
-            if line.startswith("suggestion[]=") or line.startswith("warning[]="):
-                payload = line.split("=", 1)[1]
-                parts = payload.split("|")
-                if len(parts) >= 2:
-                    finding_id = parts[0].strip()
-                    desc = parts[1].strip()
-                else:
-                    finding_id = None
-                    desc = payload
-
-                if line.startswith("warning[]="):
-                    sev = "medium"
-                else:
-                    sev = "low"
-
-                findings.append(
-                    {
-                        "id": finding_id,
-                        "title": desc,
-                        "description": desc,
-                        "severity": sev,
-                        "asset": "kaliscanner",
-                        "service": "linux",
-                        "asset_criticality": 1.0,
-                        "confidence": 1.0,
-                        "compliance": [],
-                        "source": "linux",
-                    }
-                )
+        # One regex scan over the raw bytes; only matched payloads get decoded
+        for m in LYNIS_RE.finditer(LYNIS_IN.read_bytes()):
+            payload = m.group(2).decode("utf-8", "ignore").rstrip()
+            parts = payload.split("|")
+            if len(parts) >= 2:
+                finding_id = parts[0].strip()
+                desc = parts[1].strip()
+            else:
+                finding_id = None
+                desc = payload
+
+            if m.group(1) == b"warning":
+                sev = "medium"
+            else:
+                sev = "low"
+
+            findings.append(
+                {
+                    "id": finding_id,
+                    "title": desc,
+                    "description": desc,
+                    "severity": sev,
+                    "asset": "kaliscanner",
+                    "service": "linux",
+                    "asset_criticality": 1.0,
+                    "confidence": 1.0,
+                    "compliance": [],
+                    "source": "linux",
+                }
+            )
     except Exception as e:
         print(f"[!] Failed to parse {LYNIS_IN}: {e}")
         return []
@@ -128,7 +136,8 @@ def main():
     all_findings.extend(load_aws_findings())
     all_findings.extend(load_lynis_findings())
 
-    OUT.write_text(json.dumps(all_findings, indent=2))
+    # Stdlib indent=2 goes through the slow pure-Python encoder, so only pretty-print with orjson
+    OUT.write_bytes(dump_bytes(all_findings, pretty=HAS_ORJSON))
     print(f"[+] Combined {len(all_findings)} findings -> {OUT}")
 
 
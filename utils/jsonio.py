@@ -0,0 +1,32 @@
+"""
+utils/jsonio.py
+
+JSON read/write shared by the pipeline scripts: orjson when it is installed,
+stdlib json otherwise.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson  # fast path; stdlib json is the fallback
+except ImportError:
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from bytes or str (orjson also takes memoryview/mmap data)."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def dump_bytes(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize obj as UTF-8 JSON bytes; compact unless pretty (2-space indent)."""
+    if orjson is not None:
+        opts = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            opts |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=opts)
+    fmt = {"indent": 2} if pretty else {"separators": (",", ":")}
+    return json.dumps(obj, ensure_ascii=False, **fmt).encode("utf-8")
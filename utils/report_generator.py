@@ -1,6 +1,7 @@
-import json
 from pathlib import Path
 
+from utils.jsonio import dump_bytes, loads
+
 AWS_IN = Path("reports/aws_scan.json")
 LYNIS_IN = Path("reports/lynis-report.dat")
 OUT = Path("reports/combined_summary.json")
@@ -9,11 +10,21 @@ def generate_summary():
     summary = {"aws_findings_count": None, "lynis_lines": 0}
     if AWS_IN.exists():
         try:
-            data = json.loads(AWS_IN.read_text())
+            data = loads(AWS_IN.read_bytes())
             summary["aws_findings_count"] = len(data) if isinstance(data, list) else 0
         except Exception as e:
             summary["aws_findings_count"] = f"error_parsing:{e}"
     if LYNIS_IN.exists():
-        summary["lynis_lines"] = sum(1 for _ in LYNIS_IN.open())
-    OUT.write_text(json.dumps(summary, indent=2))
+        # Count newlines in raw 1 MiB chunks; no decoding or per-line objects
+        lines = 0
+        last = b""
+        with LYNIS_IN.open("rb") as fh:
+            while chunk := fh.read(1 << 20):
+                lines += chunk.count(b"\n")
+                last = chunk
+        # A final line without a trailing newline still counts as a line
+        if last and not last.endswith(b"\n"):
+            lines += 1
+        summary["lynis_lines"] = lines
+    OUT.write_bytes(dump_bytes(summary, pretty=True))
     print("[+] Combined summary saved to", OUT)